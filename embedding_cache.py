@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+try:
+    # orjson handles the large float vectors several times faster than
+    # stdlib json; fall back silently when it isn't installed
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(vector: List[float]) -> bytes:
+    """Serialize a vector for storage."""
+    if orjson is not None:
+        return orjson.dumps(vector)
+    return json.dumps(vector).encode('utf-8')
+
+def _loads(data) -> List[float]:
+    """Deserialize a stored vector."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class EmbeddingCache:
+    """
+    A cache for embedding vectors keyed on SHA-256 of (model name, text).
+    Keeps a bounded in-memory LRU for hot lookups and persists every entry
+    to SQLite so repeated runs never re-embed unchanged text.
+    """
+
+    def __init__(self, model_name: str, cache_path: str = "./chroma_db/embedding_cache.db",
+                 max_memory_entries: int = 8192):
+        """
+        Initialize the cache for a specific embedding model.
+
+        Args:
+            model_name: The embedding model the vectors belong to
+            cache_path: Path to the SQLite file backing the cache
+            max_memory_entries: Maximum entries kept in the in-memory LRU
+        """
+        self.model_name = model_name
+        self.cache_path = cache_path
+        self.max_memory_entries = max_memory_entries
+        self._memory: OrderedDict = OrderedDict()
+
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(cache_path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (hash TEXT PRIMARY KEY, vec TEXT)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> str:
+        """Build the SHA-256 cache key for a text under the current model."""
+        payload = f"{self.model_name}\0{text}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """
+        Look up a cached embedding for the given text.
+
+        Args:
+            text: The text to look up
+
+        Returns:
+            The cached embedding vector, or None on a miss
+        """
+        key = self._key(text)
+
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        row = self._conn.execute(
+            "SELECT vec FROM embeddings WHERE hash = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        vector = _loads(row[0])
+        self._remember(key, vector)
+        return vector
+
+    def put(self, text: str, vector: List[float]) -> None:
+        """
+        Store an embedding for the given text in memory and on disk.
+
+        Args:
+            text: The text that was embedded
+            vector: The embedding vector to cache
+        """
+        self.put_many([(text, vector)])
+
+    def put_many(self, items: List[Tuple[str, List[float]]]) -> None:
+        """
+        Store many embeddings at once, in a single SQLite transaction.
+        Bulk embed runs go through here so the commit's fsync cost is paid
+        once per batch instead of once per vector.
+
+        Args:
+            items: (text, vector) pairs to cache
+        """
+        if not items:
+            return
+
+        rows = []
+        for text, vector in items:
+            key = self._key(text)
+            self._remember(key, vector)
+            rows.append((key, _dumps(vector)))
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (hash, vec) VALUES (?, ?)",
+            rows
+        )
+        self._conn.commit()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        """Add an entry to the in-memory LRU, evicting the oldest if full."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
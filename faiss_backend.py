@@ -0,0 +1,230 @@
+import os
+import pickle
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Exact search is fastest below this size; HNSW wins past it
+_HNSW_THRESHOLD = 100_000
+
+class FAISSBackend:
+    """
+    A FAISS-based vector store for tweet retrieval, exposing the same
+    add/query/get/count/delete surface as a ChromaDB collection so
+    TweetEmbedder can use either interchangeably.
+
+    Uses an exact inner-product index (IndexFlatIP) while the collection is
+    small, switching to HNSW once it grows past ~100k vectors. Tweet text
+    and metadata live in side lists keyed by row order.
+    """
+
+    def __init__(self, collection_name: str = "tweets", persist_directory: str = "./faiss_db"):
+        """
+        Initialize the backend, loading any previously persisted index.
+
+        Args:
+            collection_name: Name used for the on-disk index files
+            persist_directory: Directory to store the index and side tables
+        """
+        if faiss is None:
+            raise ImportError(
+                "faiss is required for the FAISS backend. Install it with: pip install faiss-cpu"
+            )
+
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+        self.index = None  # Created lazily once the embedding dimension is known
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+
+        os.makedirs(persist_directory, exist_ok=True)
+        self._index_path = os.path.join(persist_directory, f"{collection_name}.faiss")
+        self._side_path = os.path.join(persist_directory, f"{collection_name}.pkl")
+
+        if os.path.exists(self._index_path) and os.path.exists(self._side_path):
+            self.index = faiss.read_index(self._index_path)
+            with open(self._side_path, 'rb') as f:
+                side = pickle.load(f)
+            self.ids = side['ids']
+            self.documents = side['documents']
+            self.metadatas = side['metadatas']
+
+    def add(self, ids: List[str], embeddings: List[List[float]],
+            documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """
+        Add a batch of documents and their embeddings to the index.
+
+        Args:
+            ids: Document IDs (already-present IDs are skipped)
+            embeddings: Embedding vectors, one per document
+            documents: Document texts
+            metadatas: Metadata dictionaries, one per document
+        """
+        known = set(self.ids)
+        rows = [(doc_id, emb, doc, meta)
+                for doc_id, emb, doc, meta in zip(ids, embeddings, documents, metadatas)
+                if doc_id not in known]
+        if not rows:
+            return
+
+        matrix = np.asarray([row[1] for row in rows], dtype=np.float32)
+
+        if self.index is None:
+            self.index = self._make_index(matrix.shape[1], len(rows))
+        elif isinstance(self.index, faiss.IndexFlatIP) and \
+                self.index.ntotal + len(rows) > _HNSW_THRESHOLD:
+            self._upgrade_to_hnsw()
+
+        self.index.add(matrix)
+        for doc_id, _, doc, meta in rows:
+            self.ids.append(doc_id)
+            self.documents.append(doc)
+            self.metadatas.append(meta)
+
+        self._persist()
+
+    def upsert(self, ids: List[str], embeddings: List[List[float]],
+               documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """
+        Insert documents, replacing any whose IDs are already present.
+
+        Args:
+            ids: Document IDs
+            embeddings: Embedding vectors, one per document
+            documents: Document texts
+            metadatas: Metadata dictionaries, one per document
+        """
+        existing = set(self.ids) & set(ids)
+        if existing:
+            self.delete(list(existing))
+        self.add(ids, embeddings, documents, metadatas)
+
+    def query(self, query_embeddings: List[List[float]], n_results: int = 3,
+              **kwargs) -> Dict[str, Any]:
+        """
+        Search for the nearest documents to each query embedding.
+
+        Args:
+            query_embeddings: Query vectors to search with
+            n_results: Number of neighbors to return per query
+            **kwargs: Accepted for Chroma API compatibility (e.g. include)
+
+        Returns:
+            Dictionary shaped like a ChromaDB query result
+        """
+        if self.index is None or self.index.ntotal == 0:
+            empty = [[] for _ in query_embeddings]
+            return {"ids": empty, "documents": empty, "distances": empty,
+                    "metadatas": empty, "embeddings": empty}
+
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        n_results = min(n_results, self.index.ntotal)
+        scores, indices = self.index.search(queries, n_results)
+
+        return {
+            "ids": [[self.ids[i] for i in row] for row in indices],
+            "documents": [[self.documents[i] for i in row] for row in indices],
+            # Vectors are normalized, so inner product is cosine similarity;
+            # report cosine distance to match Chroma's convention
+            "distances": [[1.0 - score for score in row] for row in scores],
+            "metadatas": [[self.metadatas[i] for i in row] for row in indices],
+            "embeddings": [[self.index.reconstruct(int(i)).tolist() for i in row]
+                           for row in indices]
+        }
+
+    def get(self, ids: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Fetch stored documents, optionally restricted to the given IDs
+        and/or a metadata filter.
+
+        Args:
+            ids: Document IDs to look up (missing ones are silently dropped)
+            where: Metadata filter; supports equality and {"$in": [...]}
+                conditions like the Chroma subset this project uses
+
+        Returns:
+            Dictionary with the matching ids, documents and metadatas
+        """
+        if ids is None:
+            rows = range(len(self.ids))
+        else:
+            wanted = set(ids)
+            rows = [i for i, doc_id in enumerate(self.ids) if doc_id in wanted]
+
+        if where:
+            def _matches(metadata: Dict[str, Any]) -> bool:
+                for key, condition in where.items():
+                    if isinstance(condition, dict):
+                        if "$in" in condition and metadata.get(key) not in condition["$in"]:
+                            return False
+                    elif metadata.get(key) != condition:
+                        return False
+                return True
+
+            rows = [i for i in rows if _matches(self.metadatas[i])]
+
+        return {
+            "ids": [self.ids[i] for i in rows],
+            "documents": [self.documents[i] for i in rows],
+            "metadatas": [self.metadatas[i] for i in rows]
+        }
+
+    def count(self) -> int:
+        """Return the number of stored documents."""
+        return len(self.ids)
+
+    def delete(self, ids: List[str]) -> None:
+        """
+        Delete documents by ID, rebuilding the index from the survivors.
+
+        Args:
+            ids: Document IDs to remove
+        """
+        doomed = set(ids)
+        keep = [i for i, doc_id in enumerate(self.ids) if doc_id not in doomed]
+
+        survivors = None
+        if keep and self.index is not None:
+            survivors = np.vstack([self.index.reconstruct(i) for i in keep])
+
+        self.ids = [self.ids[i] for i in keep]
+        self.documents = [self.documents[i] for i in keep]
+        self.metadatas = [self.metadatas[i] for i in keep]
+
+        if self.index is not None:
+            dim = self.index.d
+            self.index = self._make_index(dim, len(keep))
+            if survivors is not None:
+                self.index.add(survivors)
+
+        self._persist()
+
+    def _make_index(self, dim: int, expected_count: int):
+        """Pick an index type for the expected collection size."""
+        if expected_count > _HNSW_THRESHOLD:
+            return faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+        return faiss.IndexFlatIP(dim)
+
+    def _upgrade_to_hnsw(self) -> None:
+        """Rebuild the flat index as HNSW once the collection outgrows it."""
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        hnsw = faiss.IndexHNSWFlat(self.index.d, 32, faiss.METRIC_INNER_PRODUCT)
+        hnsw.add(vectors)
+        self.index = hnsw
+
+    def _persist(self) -> None:
+        """Write the index and side tables to the persist directory."""
+        faiss.write_index(self.index, self._index_path)
+        with open(self._side_path, 'wb') as f:
+            pickle.dump({
+                'ids': self.ids,
+                'documents': self.documents,
+                'metadatas': self.metadatas
+            }, f)
@@ -1,27 +1,54 @@
 import ollama
+import numpy as np
 from tweet_embedder import TweetEmbedder
 import argparse
 import os
+import pickle
+import sys
+
+# Built once at import; generate_response only fills in the blanks
+_PROMPT_TEMPLATE = """Based on the following tweets:
+
+{context}
+
+Please respond to this question: {query}
+
+Use the information from the tweets to provide a relevant and helpful response."""
 
 class TweetRAG:
     """
     A Retrieval Augmented Generation application for tweets using Ollama.
     """
-    
-    def __init__(self, embedding_model: str = "mxbai-embed-large", 
-                 generation_model: str = "llama2", n_context_tweets: int = 50):
+
+    def __init__(self, embedding_model: str = "mxbai-embed-large",
+                 generation_model: str = "llama2", n_context_tweets: int = 50,
+                 semantic_cache_threshold: float = 0.97):
         """
         Initialize the RAG application.
-        
+
         Args:
             embedding_model: Model used for generating embeddings
             generation_model: Model used for text generation
             n_context_tweets: Number of similar tweets to use as context
+            semantic_cache_threshold: Cosine similarity above which a prior
+                query's cached response is reused (set > 1.0 to disable)
         """
         self.embedding_model = embedding_model
         self.generation_model = generation_model
         self.n_context_tweets = n_context_tweets
         self.embedder = TweetEmbedder(model_name=embedding_model)
+
+        # One client for all Ollama calls so the underlying httpx
+        # connection pool is reused instead of re-handshaking per request
+        self._client = ollama.Client()
+
+        # Semantic query cache: near-duplicate questions reuse the prior
+        # response without touching the vector store or generation model
+        self.semantic_cache_threshold = semantic_cache_threshold
+        self._query_cache_path = os.path.join(self.embedder.persist_directory, "query_cache.pkl")
+        self._query_cache_vecs = None  # (N, d) float32, rows L2-normalized
+        self._query_cache_responses = []
+        self._load_query_cache()
         
     def load_and_embed_tweets(self, tweets_file: str = None, tweets_dir: str = None, 
                              file_pattern: str = "*.md") -> None:
@@ -66,17 +93,29 @@ class TweetRAG:
         if len(tweets) > 3:
             print(f"  ... and {len(tweets) - 3} more tweets")
     
-    def generate_response(self, query: str, n_context_tweets: int = 50) -> str:
+    def generate_response(self, query: str, n_context_tweets: int = 50,
+                          stream: bool = False) -> str:
         """
         Generate a response to a query using relevant tweets as context.
-        
+
         Args:
             query: The user's question or prompt
             n_context_tweets: Number of similar tweets to use as context
-            
+            stream: Print tokens as they arrive instead of waiting for
+                the full response
+
         Returns:
             Generated response string
         """
+        # Check the semantic cache before doing any retrieval or generation
+        query_vec = self._embed_query(query)
+        cached_response = self._query_cache_lookup(query_vec)
+        if cached_response is not None:
+            print("Semantic cache hit - reusing response from a similar previous query")
+            if stream:
+                print(f"\n🤖 Response:\n{cached_response}")
+            return cached_response
+
         # Find similar tweets
         search_results = self.embedder.search_similar_tweets(query, n_context_tweets)
         relevant_tweets = search_results["documents"]
@@ -85,36 +124,124 @@ class TweetRAG:
         for i, tweet in enumerate(relevant_tweets, 1):
             print(f"{i}. {tweet[:100]}...")
         
-        # Combine tweets into context
-        context = "\n".join([f"- {tweet}" for tweet in relevant_tweets])
-        
-        # Create prompt for generation
-        prompt = f"""Based on the following tweets:
-
-{context}
+        # Combine tweets into context (generator - no intermediate list)
+        context = "\n".join(f"- {tweet}" for tweet in relevant_tweets)
 
-Please respond to this question: {query}
+        # Create prompt for generation
+        prompt = _PROMPT_TEMPLATE.format(context=context, query=query)
 
-Use the information from the tweets to provide a relevant and helpful response."""
-        
         print(f"\nGenerating response using {self.generation_model}...")
         
         # Generate response
         try:
-            response = ollama.generate(
-                model=self.generation_model,
-                prompt=prompt
-            )
-            return response["response"]
+            if stream:
+                # Print tokens as Ollama produces them - first output appears
+                # almost immediately instead of after the full generation
+                print(f"\n🤖 Response:")
+                chunks = []
+                for chunk in self._client.generate(model=self.generation_model,
+                                                   prompt=prompt, stream=True):
+                    sys.stdout.write(chunk['response'])
+                    sys.stdout.flush()
+                    chunks.append(chunk['response'])
+                print()
+                response_text = ''.join(chunks)
+            else:
+                response = self._client.generate(
+                    model=self.generation_model,
+                    prompt=prompt
+                )
+                response_text = response["response"]
+            self._query_cache_store(query_vec, response_text)
+            return response_text
         except Exception as e:
             return f"Error generating response: {e}"
-    
+
+    def warm_up(self) -> None:
+        """
+        Pre-load both models on the Ollama server so the first real query
+        doesn't pay model-loading latency on top of inference.
+        """
+        try:
+            self._client.embed(model=self.embedding_model, input="warm-up")
+            self._client.generate(model=self.generation_model, prompt="",
+                                  options={"num_predict": 1})
+        except Exception as e:
+            print(f"Warning: Model warm-up failed: {e}")
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a query (through the embedder's cache) and L2-normalize it.
+
+        Args:
+            query: The query text to embed
+
+        Returns:
+            The normalized query vector as a float32 array
+        """
+        vector = self.embedder.embedding_cache.get(query)
+        if vector is None:
+            response = self._client.embed(model=self.embedding_model, input=query)
+            vector = response["embeddings"][0]
+            self.embedder.embedding_cache.put(query, vector)
+
+        vector = np.asarray(vector, dtype=np.float32)
+        return vector / max(np.linalg.norm(vector), 1e-12)
+
+    def _query_cache_lookup(self, query_vec: np.ndarray):
+        """
+        Return the cached response for the most similar prior query, or None
+        if nothing clears the similarity threshold.
+        """
+        if self._query_cache_vecs is None or len(self._query_cache_responses) == 0:
+            return None
+
+        sims = self._query_cache_vecs @ query_vec
+        best = int(np.argmax(sims))
+        if sims[best] >= self.semantic_cache_threshold:
+            return self._query_cache_responses[best]
+        return None
+
+    def _query_cache_store(self, query_vec: np.ndarray, response: str) -> None:
+        """Add a query/response pair to the semantic cache and persist it."""
+        row = query_vec.reshape(1, -1)
+        if self._query_cache_vecs is None:
+            self._query_cache_vecs = row
+        else:
+            self._query_cache_vecs = np.vstack([self._query_cache_vecs, row])
+        self._query_cache_responses.append(response)
+
+        try:
+            with open(self._query_cache_path, 'wb') as f:
+                pickle.dump({
+                    'vecs': self._query_cache_vecs,
+                    'responses': self._query_cache_responses
+                }, f)
+        except Exception as e:
+            print(f"Warning: Could not persist query cache: {e}")
+
+    def _load_query_cache(self) -> None:
+        """Load a previously persisted semantic query cache, if any."""
+        if not os.path.exists(self._query_cache_path):
+            return
+        try:
+            with open(self._query_cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            self._query_cache_vecs = cached['vecs']
+            self._query_cache_responses = cached['responses']
+            print(f"Loaded semantic query cache with {len(self._query_cache_responses)} entries")
+        except Exception as e:
+            print(f"Warning: Could not load query cache: {e}")
+
     def interactive_chat(self):
         """
         Start an interactive chat session.
         """
         print("\n🤖 Llama Tweets Chat - Ask questions about the tweet history!")
         print("Type 'quit' or 'exit' to end the session.\n")
+
+        # Load models while the user is typing their first question
+        self.warm_up()
         
         while True:
             query = input("❓ Your question: ").strip()
@@ -127,8 +254,8 @@ Use the information from the tweets to provide a relevant and helpful response."
                 continue
             
             try:
-                response = self.generate_response(query, self.n_context_tweets)
-                print(f"\n🤖 Response:\n{response}\n")
+                self.generate_response(query, self.n_context_tweets, stream=True)
+                print()
                 print("-" * 50)
             except KeyboardInterrupt:
                 print("\n👋 Goodbye!")
@@ -173,7 +173,61 @@ def test_persistent_storage():
     
     print("\n✅ Persistent storage test completed!")
 
+def test_batch_embedding_alignment():
+    """Regression test: embeddings stay paired with their documents even
+    when the adaptive batch size changes in the middle of an embed run."""
+
+    print("\n🔬 Testing Batch/Document Alignment")
+    print("=" * 50)
+
+    from tweet_embedder import TweetEmbedder
+
+    embedder = TweetEmbedder(collection_name="test_alignment",
+                             persist_directory="./test_chroma_db", batch_size=2)
+    embedder._gpu_probed = True  # skip the Ollama warm-up probe
+
+    n_tweets = 10
+    tweets = [{'content': f"alignment tweet {i}", 'tweet_id': f"align_{i}"}
+              for i in range(n_tweets)]
+    index_of = {tweet['content']: i for i, tweet in enumerate(tweets)}
+
+    # Stub the Ollama round-trip: each text embeds to a one-hot vector of
+    # its input position, and the stub resizes the batch size mid-run the
+    # way the adaptive sizing does after sustained successes
+    def one_hot_embed_batches(batches):
+        embedder.batch_size = 8
+        return [[[1.0 if j == index_of[text] else 0.0 for j in range(n_tweets)]
+                 for text in batch]
+                for batch in batches]
+
+    embedder._embed_batches = one_hot_embed_batches
+
+    try:
+        embedder.embed_tweets(tweets)
+
+        results = embedder.collection.get(include=["documents", "embeddings"])
+        mismatched = 0
+        for doc, embedding in zip(results['documents'], results['embeddings']):
+            stored_index = max(range(len(embedding)), key=lambda j: embedding[j])
+            if stored_index != index_of[doc]:
+                mismatched += 1
+
+        if len(results['documents']) != n_tweets:
+            print(f"❌ Expected {n_tweets} documents, found {len(results['documents'])}")
+        elif mismatched:
+            print(f"❌ {mismatched} documents stored with another tweet's embedding")
+        else:
+            print("✅ Embeddings stayed paired with their documents across a batch-size change")
+    except Exception as e:
+        print(f"❌ Alignment test failed: {e}")
+    finally:
+        # Clean up test collection
+        embedder.clear_collection()
+
+    print("\n✅ Batch alignment test completed!")
+
 if __name__ == "__main__":
     test_rag_system()
     test_individual_components()
     test_persistent_storage()
+    test_batch_embedding_alignment()
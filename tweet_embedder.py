@@ -1,40 +1,166 @@
 import ollama
 import chromadb
+import numpy as np
+import asyncio
+import hashlib
+import mmap
 import os
 import re
 import glob
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List, Dict, Any, Optional, Tuple
+from embedding_cache import EmbeddingCache
+
+# Compiled once, as bytes patterns so they can run directly over a
+# memory-mapped file: a tweet record is a blockquote block followed by
+# the non-blockquote lines that hold its timestamp/URL metadata
+_TWEET_RECORD_RE = re.compile(
+    rb'(?P<block>(?:^[ \t]*>.*(?:\n|\Z))+)'
+    rb'(?P<meta>(?:^(?![ \t]*>)(?!----).*(?:\n|\Z))*)',
+    re.MULTILINE
+)
+_BLOCKQUOTE_RE = re.compile(rb'^[ \t]*>\s?(.*)$', re.MULTILINE)
+# Pattern: [Tue Aug 05 14:19:12 +0000 2008](https://twitter.com/dammitandy/status/878282969)
+_TWEET_URL_RE = re.compile(rb'\[([^\]]+)\]\((https://twitter\.com/[^)]+/status/(\d+))\)')
+
+# Embedding models cap their context anyway (mxbai-embed-large: 512 tokens),
+# so sending more than this per tweet only burns tokenizer time
+_MAX_EMBED_CHARS = 1024
+
+def _parse_md_file(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Parse a single markdown tweet archive file.
+    Module-level (not a method) so ProcessPoolExecutor workers can pickle it.
+
+    Args:
+        file_path: Path to the markdown tweets file
+
+    Returns:
+        List of tweet dictionaries with content and metadata
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Tweet file not found: {file_path}")
+
+    file_ext = os.path.splitext(file_path)[1].lower()
+
+    if file_ext != '.md':
+        raise ValueError(f"Only markdown (.md) files are supported. Got: {file_ext}")
+
+    tweets = []
+
+    # Memory-map the file and run the compiled bytes patterns over it
+    # directly, so the archive is never copied into Python strings;
+    # only the captured slices get decoded
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            print(f"Loaded 0 tweets from markdown file: {file_path}")
+            return tweets
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            # Single pass over the file: each match is one blockquote
+            # tweet plus the metadata lines that follow it
+            for i, record in enumerate(_TWEET_RECORD_RE.finditer(mm)):
+                content_lines = [line.strip() for line in _BLOCKQUOTE_RE.findall(record.group('block'))]
+                tweet_content = b' '.join(line for line in content_lines if line).decode('utf-8')
+                if not tweet_content:
+                    continue
+
+                # Extract timestamp and URL from the metadata lines
+                metadata = {}
+                url_match = _TWEET_URL_RE.search(record.group('meta'))
+                if url_match:
+                    metadata['timestamp'] = url_match.group(1).decode('utf-8')
+                    metadata['url'] = url_match.group(2).decode('utf-8')
+                    metadata['tweet_id'] = url_match.group(3).decode('utf-8')
+
+                tweets.append({
+                    'content': tweet_content,
+                    'tweet_id': metadata.get('tweet_id', f"md_{i}"),
+                    'timestamp': metadata.get('timestamp'),
+                    'url': metadata.get('url'),
+                    'source_file': file_path,
+                    'format': 'markdown'
+                })
+        finally:
+            mm.close()
+
+    print(f"Loaded {len(tweets)} tweets from markdown file: {file_path}")
+    return tweets
 
 class TweetEmbedder:
     """
     A class to handle tweet embedding and storage using Ollama and ChromaDB.
     """
     
-    def __init__(self, model_name: str = "mxbai-embed-large", collection_name: str = "tweets", 
-                 persist_directory: str = "./chroma_db"):
+    def __init__(self, model_name: str = "mxbai-embed-large", collection_name: str = "tweets",
+                 persist_directory: str = "./chroma_db", batch_size: int = 64,
+                 vector_backend: str = "chroma", max_batch_size: int = 256):
         """
         Initialize the TweetEmbedder with specified model and collection.
-        
+
         Args:
             model_name: The Ollama embedding model to use
             collection_name: The ChromaDB collection name
-            persist_directory: Directory to store the persistent ChromaDB database
+            persist_directory: Directory to store the persistent vector database
+            batch_size: Starting number of tweets to embed per Ollama request
+                (adapts downward on failures, upward on sustained success)
+            vector_backend: Vector store to use, "chroma" (default) or "faiss"
+                (requires faiss-cpu; faster pure-retrieval queries)
+            max_batch_size: Ceiling the adaptive batch size can grow to
         """
         self.model_name = model_name
         self.collection_name = collection_name
         self.persist_directory = persist_directory
-        
-        # Create persistent ChromaDB client
-        self.client = chromadb.PersistentClient(path=persist_directory)
-        
-        # Create or get the collection
-        try:
-            self.collection = self.client.get_collection(name=collection_name)
-            count = self.collection.count()
-            print(f"Loaded existing collection '{collection_name}' with {count} documents")
-        except:
-            self.collection = self.client.create_collection(name=collection_name)
-            print(f"Created new collection '{collection_name}'")
+        self.batch_size = batch_size
+        self.max_batch_size = max_batch_size
+        self.vector_backend = vector_backend
+        self._batch_successes = 0
+        self._gpu_probed = False
+
+        # One client for all Ollama calls so the underlying httpx
+        # connection pool is reused instead of re-handshaking per request
+        self._client = ollama.Client()
+
+        if vector_backend == "faiss":
+            # FAISSBackend mirrors the Chroma collection API, so the rest of
+            # the embedder doesn't care which store it's talking to
+            from faiss_backend import FAISSBackend
+            self.collection = FAISSBackend(collection_name=collection_name,
+                                           persist_directory=persist_directory)
+            print(f"Using FAISS backend for '{collection_name}' with {self.collection.count()} documents")
+        else:
+            # Create persistent ChromaDB client
+            self.client = chromadb.PersistentClient(path=persist_directory)
+
+            # Create or get the collection
+            try:
+                self.collection = self.client.get_collection(name=collection_name)
+                count = self.collection.count()
+                print(f"Loaded existing collection '{collection_name}' with {count} documents")
+            except:
+                # Cosine space matches the embedding model; higher construction_ef/M
+                # trade a little index-build time for better recall at query time
+                self.collection = self.client.create_collection(
+                    name=collection_name,
+                    metadata={
+                        "hnsw:space": "cosine",
+                        "hnsw:construction_ef": 200,
+                        "hnsw:M": 32
+                    }
+                )
+                print(f"Created new collection '{collection_name}'")
+
+        # Tweet IDs and content hashes known to be in the collection; grow
+        # as lookups and inserts happen so repeat embed_tweets calls skip
+        # re-querying
+        self._embedded_ids_cache: set = set()
+        self._embedded_shas_cache: set = set()
+
+        # Cache embeddings so identical texts are never sent to Ollama twice
+        self.embedding_cache = EmbeddingCache(
+            model_name=model_name,
+            cache_path=os.path.join(persist_directory, "embedding_cache.db")
+        )
     
     def load_tweets_from_file(self, file_path: str) -> List[Dict[str, Any]]:
         """
@@ -46,82 +172,7 @@ class TweetEmbedder:
         Returns:
             List of tweet dictionaries with content and metadata
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Tweet file not found: {file_path}")
-        
-        file_ext = os.path.splitext(file_path)[1].lower()
-        
-        if file_ext != '.md':
-            raise ValueError(f"Only markdown (.md) files are supported. Got: {file_ext}")
-        
-        return self._load_tweets_from_markdown(file_path)
-    
-    def _load_tweets_from_markdown(self, file_path: str) -> List[Dict[str, Any]]:
-        """Load tweets from markdown format with metadata."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        tweets = []
-        
-        # Split by ---- separators
-        sections = content.split('----')
-        
-        for i, section in enumerate(sections):
-            section = section.strip()
-            if not section:
-                continue
-            
-            # Extract tweet content (blockquote)
-            tweet_content = self._extract_tweet_content(section)
-            if not tweet_content:
-                continue
-            
-            # Extract metadata
-            metadata = self._extract_tweet_metadata(section)
-            
-            tweets.append({
-                'content': tweet_content,
-                'tweet_id': metadata.get('tweet_id', f"md_{i}"),
-                'timestamp': metadata.get('timestamp'),
-                'url': metadata.get('url'),
-                'source_file': file_path,
-                'format': 'markdown'
-            })
-        
-        print(f"Loaded {len(tweets)} tweets from markdown file: {file_path}")
-        return tweets
-    
-    def _extract_tweet_content(self, section: str) -> Optional[str]:
-        """Extract tweet content from a markdown section."""
-        # Look for blockquote content (> text)
-        lines = section.split('\n')
-        content_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('>'):
-                # Remove the > and any leading whitespace
-                content = line[1:].strip()
-                if content:
-                    content_lines.append(content)
-        
-        return ' '.join(content_lines) if content_lines else None
-    
-    def _extract_tweet_metadata(self, section: str) -> Dict[str, str]:
-        """Extract metadata from a markdown section."""
-        metadata = {}
-        
-        # Extract timestamp and URL from the image tag line
-        # Pattern: [Tue Aug 05 14:19:12 +0000 2008](https://twitter.com/dammitandy/status/878282969)
-        url_pattern = r'\[([^\]]+)\]\((https://twitter\.com/[^)]+/status/(\d+))\)'
-        match = re.search(url_pattern, section)
-        
-        if match:
-            metadata['timestamp'] = match.group(1)
-            metadata['url'] = match.group(2)
-            metadata['tweet_id'] = match.group(3)
-        
-        return metadata
+        return _parse_md_file(file_path)
     
     def load_tweets_from_directory(self, directory_path: str, file_pattern: str = "*.md") -> List[Dict[str, Any]]:
         """
@@ -138,135 +189,473 @@ class TweetEmbedder:
             raise FileNotFoundError(f"Directory not found: {directory_path}")
         
         pattern = os.path.join(directory_path, file_pattern)
-        files = glob.glob(pattern)
-        
+
+        # Simple "*<suffix>" patterns (the default *.md) use os.scandir,
+        # which skips glob's fnmatch compilation and per-entry stat calls;
+        # anything fancier falls back to glob
+        if (file_pattern.startswith('*')
+                and not any(c in file_pattern[1:] for c in '*?[')):
+            suffix = file_pattern[1:]
+            files = [entry.path for entry in os.scandir(directory_path)
+                     if entry.is_file() and entry.name.endswith(suffix)]
+        else:
+            files = glob.glob(pattern)
+
         if not files:
             print(f"No files found matching pattern: {pattern}")
             return []
         
+        # Parse files in parallel; parsing is CPU-bound with no inter-file
+        # dependency, so workers scale with core count
+        sorted_files = sorted(files)
+        parsed = {}
+        with ProcessPoolExecutor(max_workers=min(len(sorted_files), os.cpu_count() or 1)) as executor:
+            futures = {executor.submit(_parse_md_file, file_path): file_path
+                       for file_path in sorted_files}
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    parsed[file_path] = future.result()
+                except Exception as e:
+                    print(f"Error loading {file_path}: {e}")
+
+        # Flatten in sorted-filename order so results stay deterministic
         all_tweets = []
-        for file_path in sorted(files):
-            try:
-                tweets = self.load_tweets_from_file(file_path)
-                all_tweets.extend(tweets)
-            except Exception as e:
-                print(f"Error loading {file_path}: {e}")
-                continue
-        
+        for file_path in sorted_files:
+            all_tweets.extend(parsed.get(file_path, []))
+
         print(f"Total tweets loaded from {len(files)} files: {len(all_tweets)}")
         return all_tweets
     
-    def embed_tweets(self, tweets: List[Dict[str, Any]]) -> None:
+    def embed_tweets(self, tweets: List[Dict[str, Any]], report_total: bool = False) -> None:
         """
         Generate embeddings for tweets and store them in ChromaDB.
         Only processes tweets that haven't been embedded yet.
-        
+
         Args:
             tweets: List of tweet dictionaries to embed
+            report_total: Also print the collection's total document count
+                (costs a metadata-store walk in ChromaDB)
         """
         print(f"Checking {len(tweets)} tweets for embedding using {self.model_name}...")
         
-        # Check for already embedded tweets
-        embedded_tweet_ids = self._get_embedded_tweet_ids()
+        # Check which of the candidate tweets are already embedded
+        embedded_tweet_ids = self._get_embedded_tweet_ids(tweets)
         print(f"Found {len(embedded_tweet_ids)} already embedded tweets")
         
-        # Filter out already embedded tweets
-        new_tweets = []
-        skipped_count = 0
-        
-        for tweet in tweets:
-            tweet_id = tweet.get('tweet_id', f"unknown_{len(new_tweets)}")
-            if tweet_id in embedded_tweet_ids:
-                skipped_count += 1
-            else:
-                new_tweets.append(tweet)
-        
+        # Filter out already embedded tweets - and duplicate IDs within the
+        # input - in a single comprehension pass; tweets without an ID get
+        # per-tweet unknown_<n> fallbacks later, so they never dedup here
+        seen = set()
+        new_tweets = [tweet for tweet in tweets
+                      if (tid := tweet.get('tweet_id')) not in embedded_tweet_ids
+                      and (tid is None or not (tid in seen or seen.add(tid)))]
+        skipped_count = len(tweets) - len(new_tweets)
+
         print(f"Skipping {skipped_count} already embedded tweets")
+
+        # Content-level dedup: retweets and cross-file copies share the same
+        # text under different IDs, so also skip anything whose content hash
+        # is already stored (or appears earlier in this input)
+        if new_tweets:
+            candidate_shas = [hashlib.sha256(tweet['content'].encode('utf-8')).hexdigest()
+                              for tweet in new_tweets]
+            embedded_shas = self._get_embedded_content_shas(candidate_shas)
+            seen_shas = set()
+            deduped = [tweet for tweet, sha in zip(new_tweets, candidate_shas)
+                       if sha not in embedded_shas
+                       and not (sha in seen_shas or seen_shas.add(sha))]
+            duplicate_count = len(new_tweets) - len(deduped)
+            if duplicate_count:
+                print(f"Skipping {duplicate_count} tweets with duplicate content")
+            new_tweets = deduped
+
         print(f"Processing {len(new_tweets)} new tweets...")
         
         if not new_tweets:
             print("No new tweets to embed!")
             return
-        
+
+        # First embed run: load the model now and size batches for GPU if
+        # the server offloaded it there
+        if not self._gpu_probed:
+            self._probe_gpu()
+
+        # Build the per-tweet columns up front (struct-of-arrays) so the
+        # batch loop below never probes the tweet dicts again
+        contents = [tweet['content'] for tweet in new_tweets]
+        tweet_ids = [tweet.get('tweet_id', f"unknown_{i}") for i, tweet in enumerate(new_tweets)]
+        lengths = list(map(len, contents))
+        content_shas = [hashlib.sha256(content.encode('utf-8')).hexdigest() for content in contents]
+        source_files = [tweet.get('source_file', 'unknown') for tweet in new_tweets]
+        formats = [tweet.get('format', 'markdown') for tweet in new_tweets]
+        timestamps = [tweet.get('timestamp') for tweet in new_tweets]
+        urls = [tweet.get('url') for tweet in new_tweets]
+
+        # Zip the columns into metadata dicts for storage
+        metadatas = []
+        for tweet_id, length, sha, source_file, fmt, timestamp, url in zip(
+                tweet_ids, lengths, content_shas, source_files, formats, timestamps, urls):
+            metadata = {
+                "tweet_id": tweet_id,
+                "length": length,
+                "content_sha": sha,
+                "source_file": source_file,
+                "format": fmt
+            }
+            if timestamp:
+                metadata['timestamp'] = timestamp
+            if url:
+                metadata['url'] = url
+            metadatas.append(metadata)
+
+        # Cap what gets sent to the embedding model; overly long entries are
+        # usually concatenated thread blockquotes
+        truncated_count = sum(1 for length in lengths if length > _MAX_EMBED_CHARS)
+        if truncated_count:
+            print(f"Truncating {truncated_count} tweets to {_MAX_EMBED_CHARS} chars for embedding")
+
+        # Split into batches and embed them concurrently. Snapshot the batch
+        # size first: the adaptive resize hooks may change self.batch_size
+        # mid-run, and the row offsets below must match the slicing used to
+        # build these batches
+        batch_size = self.batch_size
+        batch_results = self._embed_batches(
+            [[content[:_MAX_EMBED_CHARS] for content in contents[start:start + batch_size]]
+             for start in range(0, len(contents), batch_size)])
+
         processed_count = 0
-        for tweet in new_tweets:
-            try:
-                # Extract content for embedding
-                tweet_content = tweet['content']
-                tweet_id = tweet.get('tweet_id', f"unknown_{processed_count}")
-                
-                # Generate embedding using Ollama
-                response = ollama.embed(model=self.model_name, input=tweet_content)
-                embeddings = response["embeddings"][0]  # Extract the first (and only) embedding
-                
-                # Prepare metadata for storage
-                metadata = {
-                    "tweet_id": tweet_id,
-                    "length": len(tweet_content),
-                    "source_file": tweet.get('source_file', 'unknown'),
-                    "format": tweet.get('format', 'markdown')
-                }
-                
-                # Add timestamp if available
-                if tweet.get('timestamp'):
-                    metadata['timestamp'] = tweet['timestamp']
-                
-                # Add URL if available
-                if tweet.get('url'):
-                    metadata['url'] = tweet['url']
-                
+        for batch_num, batch_embeddings in enumerate(batch_results, 1):
+            offset = (batch_num - 1) * batch_size
+
+            # Assemble parallel lists for a single ChromaDB insert
+            batch_ids = []
+            batch_embs = []
+            batch_docs = []
+            batch_metadatas = []
+
+            for j, embedding in enumerate(batch_embeddings):
+                if embedding is None:
+                    continue
+
+                row = offset + j
                 # Use tweet_id as the document ID for consistent deduplication
-                doc_id = f"tweet_{tweet_id}"
-                
-                # Store in ChromaDB
-                self.collection.add(
-                    ids=[doc_id],
-                    embeddings=[embeddings],  # Wrap in list for ChromaDB
-                    documents=[tweet_content],
-                    metadatas=[metadata]
-                )
-                
+                batch_ids.append(f"tweet_{tweet_ids[row]}")
+                batch_embs.append(embedding)
+                batch_docs.append(contents[row])
+                batch_metadatas.append(metadatas[row])
                 processed_count += 1
-                if processed_count % 5 == 0:
-                    print(f"Processed {processed_count}/{len(new_tweets)} new tweets")
-                    
-            except Exception as e:
-                print(f"Error processing tweet {tweet_id}: {e}")
-                continue
-        
-        total_count = self.collection.count()
+
+            # Store the whole batch at once; quantize as one contiguous
+            # matrix so normalization is a single vectorized operation
+            if batch_ids:
+                matrix = self._quantize_batch(batch_embs)
+                if self.vector_backend == "faiss":
+                    # FAISS takes the ndarray directly - no re-boxing to lists
+                    embeddings_out = matrix
+                else:
+                    embeddings_out = matrix.tolist()
+                # upsert is idempotent on ID, so a stale dedup set can never
+                # cause a duplicate-ID error mid-load
+                self.collection.upsert(
+                    ids=batch_ids,
+                    embeddings=embeddings_out,
+                    documents=batch_docs,
+                    metadatas=batch_metadatas
+                )
+                self._embedded_ids_cache.update(meta['tweet_id'] for meta in batch_metadatas)
+                self._embedded_shas_cache.update(meta['content_sha'] for meta in batch_metadatas)
+
+            print(f"Processed {min(batch_num * batch_size, len(new_tweets))}/{len(new_tweets)} new tweets")
+
         print(f"Embedding process completed! Added {processed_count} new tweets.")
-        print(f"Total tweets in collection: {total_count}")
+        if report_total:
+            # count() walks Chroma's metadata store, so only pay for it on request
+            print(f"Total tweets in collection: {self.collection.count()}")
     
-    def search_similar_tweets(self, query: str, n_results: int = 3) -> Dict[str, Any]:
+    def _quantize(self, embedding: List[float]) -> List[float]:
+        """
+        L2-normalize an embedding and round it to float16 precision.
+        Normalized vectors make cosine and inner-product ranking equivalent,
+        and fp16 precision is plenty for text-embedding similarity while
+        halving the bytes a vector needs.
+
+        Args:
+            embedding: The raw embedding vector from Ollama
+
+        Returns:
+            The normalized, fp16-rounded vector as a list of floats
+        """
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec /= norm
+        return vec.astype(np.float16).tolist()
+
+    def _quantize_batch(self, embeddings: List[List[float]]) -> np.ndarray:
+        """
+        Pack a batch of embeddings into one contiguous float32 matrix,
+        L2-normalize every row in a single vectorized call, and round to
+        fp16 precision. Struct-of-arrays layout lets NumPy/BLAS stride
+        through the whole batch instead of touching one Python list at
+        a time.
+
+        Args:
+            embeddings: Raw embedding vectors from Ollama
+
+        Returns:
+            An (N, dim) float32 array of normalized, fp16-rounded vectors
+        """
+        matrix = np.empty((len(embeddings), len(embeddings[0])), dtype=np.float32)
+        for i, embedding in enumerate(embeddings):
+            matrix[i] = embedding
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, np.maximum(norms, 1e-12), out=matrix)
+        return matrix.astype(np.float16).astype(np.float32)
+
+    def _embed_batches(self, batches: List[List[str]]) -> List[List[Optional[List[float]]]]:
+        """
+        Embed multiple batches of texts, serving repeats from the embedding
+        cache and sending only cache misses to Ollama.
+
+        Args:
+            batches: List of text batches to embed
+
+        Returns:
+            List of embedding lists, one per input batch
+        """
+        # Serve whatever we can from the cache first
+        results = [[self.embedding_cache.get(text) for text in texts] for texts in batches]
+
+        miss_positions = []
+        miss_batches = []
+        for batch_num, (texts, vectors) in enumerate(zip(batches, results)):
+            positions = [i for i, vector in enumerate(vectors) if vector is None]
+            if positions:
+                miss_positions.append((batch_num, positions))
+                miss_batches.append([texts[i] for i in positions])
+
+        cache_hits = sum(len(texts) for texts in batches) - sum(len(b) for b in miss_batches)
+        if cache_hits:
+            print(f"Embedding cache served {cache_hits} texts")
+
+        if miss_batches:
+            fresh = self._embed_batches_concurrent(miss_batches)
+            for (batch_num, positions), texts, vectors in zip(miss_positions, miss_batches, fresh):
+                fresh_items = []
+                for position, text, vector in zip(positions, texts, vectors):
+                    if vector is not None:
+                        fresh_items.append((text, vector))
+                    results[batch_num][position] = vector
+                # One cache transaction per batch, not one per vector
+                self.embedding_cache.put_many(fresh_items)
+
+        return results
+
+    def _embed_batches_concurrent(self, batches: List[List[str]]) -> List[List[Optional[List[float]]]]:
+        """
+        Embed multiple batches of texts concurrently using Ollama's async client.
+        Concurrency is capped by the OLLAMA_NUM_PARALLEL environment variable
+        (default 4) to match the server's parallelism.
+
+        Args:
+            batches: List of text batches to embed
+
+        Returns:
+            List of embedding lists, one per input batch
+        """
+        max_concurrent = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
+        async def _run():
+            client = ollama.AsyncClient()
+            semaphore = asyncio.Semaphore(max_concurrent)
+
+            async def _embed_one(texts):
+                async with semaphore:
+                    response = await client.embed(model=self.model_name, input=texts)
+                    return response["embeddings"]
+
+            return await asyncio.gather(*(_embed_one(texts) for texts in batches),
+                                        return_exceptions=True)
+
+        try:
+            results = asyncio.run(_run())
+        except Exception as e:
+            print(f"Concurrent embedding unavailable ({e}), falling back to sequential batches...")
+            return [self._embed_batch(texts) for texts in batches]
+
+        # Retry any batch that failed concurrently with the sequential fallback
+        all_embeddings = []
+        for texts, result in zip(batches, results):
+            if isinstance(result, Exception):
+                all_embeddings.append(self._embed_batch(texts))
+            else:
+                self._note_batch_success()
+                all_embeddings.append(result)
+        return all_embeddings
+
+    def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embed a batch of texts with a single Ollama request.
+        A failed batch is split in half and retried recursively, so one bad
+        input (or an overloaded server) costs retries instead of the whole
+        batch; failures and successes also feed the adaptive batch size.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors (None for texts that failed to embed)
+        """
+        try:
+            response = self._client.embed(model=self.model_name, input=texts)
+            self._note_batch_success()
+            return response["embeddings"]
+        except Exception as e:
+            if len(texts) == 1:
+                print(f"Error embedding tweet: {e}")
+                return [None]
+            print(f"Batch of {len(texts)} failed ({e}), splitting and retrying...")
+            self._note_batch_failure()
+            mid = len(texts) // 2
+            return self._embed_batch(texts[:mid]) + self._embed_batch(texts[mid:])
+
+    def _probe_gpu(self) -> None:
+        """
+        Send a warm-up embed so the model's weights are loaded before the
+        first real batch, then check whether the server put the model in
+        VRAM; GPU-served embedding models handle much larger batches.
+        """
+        self._gpu_probed = True
+        try:
+            self._client.embed(model=self.model_name, input="warm-up")
+            loaded = self._client.ps()
+            models = loaded.get('models') if isinstance(loaded, dict) else getattr(loaded, 'models', None)
+            for entry in models or []:
+                if isinstance(entry, dict):
+                    entry_name, size_vram = entry.get('name', ''), entry.get('size_vram', 0)
+                else:
+                    entry_name, size_vram = getattr(entry, 'name', ''), getattr(entry, 'size_vram', 0)
+                if self.model_name in str(entry_name) and size_vram:
+                    if self.batch_size < 128 <= self.max_batch_size:
+                        self.batch_size = 128
+                        print(f"{self.model_name} is GPU-resident; raising embed batch size to 128")
+                    break
+        except Exception as e:
+            print(f"Warning: Could not probe Ollama for GPU offload: {e}")
+
+    def _note_batch_success(self) -> None:
+        """Grow the batch size after sustained successful batches."""
+        self._batch_successes += 1
+        if self._batch_successes >= 8 and self.batch_size < self.max_batch_size:
+            self.batch_size = min(self.batch_size * 2, self.max_batch_size)
+            self._batch_successes = 0
+            print(f"Raising embed batch size to {self.batch_size}")
+
+    def _note_batch_failure(self) -> None:
+        """Halve the batch size after a failed batch."""
+        self._batch_successes = 0
+        if self.batch_size > 1:
+            self.batch_size = max(self.batch_size // 2, 1)
+            print(f"Lowering embed batch size to {self.batch_size}")
+
+    def search_similar_tweets(self, query: str, n_results: int = 3,
+                              mmr: bool = False, mmr_lambda: float = 0.5) -> Dict[str, Any]:
         """
         Search for tweets similar to the given query.
-        
+
         Args:
             query: The search query
             n_results: Number of similar tweets to return
-            
+            mmr: Re-rank with Maximal Marginal Relevance for diverse results
+            mmr_lambda: MMR trade-off between relevance (1.0) and diversity (0.0)
+
         Returns:
             Dictionary containing the search results
         """
         print(f"Searching for tweets similar to: '{query}'")
-        
-        # Generate embedding for the query
-        response = ollama.embed(model=self.model_name, input=query)
-        query_embedding = response["embeddings"][0]  # Extract the first embedding
-        
-        # Search for similar tweets
+
+        # Generate embedding for the query (cached for repeated queries)
+        query_embedding = self.embedding_cache.get(query)
+        if query_embedding is None:
+            response = self._client.embed(model=self.model_name, input=query)
+            query_embedding = response["embeddings"][0]  # Extract the first embedding
+            self.embedding_cache.put(query, query_embedding)
+
+        query_vec = self._quantize(query_embedding)
+
+        if mmr:
+            # Over-fetch neighbors, then re-rank for diversity
+            results = self.collection.query(
+                query_embeddings=[query_vec],
+                n_results=n_results * 4,
+                include=["documents", "distances", "metadatas", "embeddings"]
+            )
+            order = self._mmr(np.asarray(query_vec, dtype=np.float32),
+                              np.asarray(results["embeddings"][0], dtype=np.float32),
+                              n_results, mmr_lambda)
+            return {
+                "query": query,
+                "documents": [results["documents"][0][i] for i in order],
+                "distances": [results["distances"][0][i] for i in order]
+                             if results.get("distances") is not None else None,
+                "metadatas": [results["metadatas"][0][i] for i in order]
+                             if results.get("metadatas") is not None else None
+            }
+
+        # Search for similar tweets (same normalization as the stored vectors)
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=[query_vec],
             n_results=n_results
         )
-        
+
         return {
             "query": query,
             "documents": results["documents"][0],
             "distances": results["distances"][0] if "distances" in results else None,
             "metadatas": results["metadatas"][0] if "metadatas" in results else None
         }
+
+    def _mmr(self, query_vec: "np.ndarray", cand_vecs: "np.ndarray",
+             k: int, lambda_: float = 0.5) -> List[int]:
+        """
+        Select k candidates by Maximal Marginal Relevance, balancing query
+        relevance against redundancy with the already-selected set. All
+        similarities are computed as vectorized NumPy matrix products; the
+        only Python loop is the k selection steps.
+
+        Args:
+            query_vec: The query embedding
+            cand_vecs: Candidate embeddings, one row per candidate
+            k: Number of candidates to select
+            lambda_: Trade-off between relevance (1.0) and diversity (0.0)
+
+        Returns:
+            Indices of the selected candidates, in selection order
+        """
+        if len(cand_vecs) == 0:
+            return []
+
+        # Normalize so dot products are cosine similarities
+        cand = cand_vecs / np.maximum(np.linalg.norm(cand_vecs, axis=1, keepdims=True), 1e-12)
+        q = query_vec / max(np.linalg.norm(query_vec), 1e-12)
+
+        sims_q = cand @ q
+        pairwise = cand @ cand.T
+
+        selected: List[int] = []
+        remaining = np.ones(len(cand), dtype=bool)
+        for _ in range(min(k, len(cand))):
+            if selected:
+                redundancy = pairwise[:, selected].max(axis=1)
+                score = lambda_ * sims_q - (1 - lambda_) * redundancy
+            else:
+                score = sims_q
+            pick = int(np.argmax(np.where(remaining, score, -np.inf)))
+            selected.append(pick)
+            remaining[pick] = False
+
+        return selected
     
     def get_collection_info(self) -> Dict[str, Any]:
         """
@@ -296,6 +685,8 @@ class TweetEmbedder:
                 print(f"Cleared {len(results['ids'])} documents from collection '{self.collection_name}'")
             else:
                 print(f"Collection '{self.collection_name}' is already empty")
+            self._embedded_ids_cache = set()
+            self._embedded_shas_cache = set()
         except Exception as e:
             print(f"Error clearing collection: {e}")
     
@@ -309,17 +700,50 @@ class TweetEmbedder:
         except:
             return False
     
-    def _get_embedded_tweet_ids(self) -> set:
-        """Get all tweet IDs that are already embedded."""
+    def _get_embedded_tweet_ids(self, tweets: List[Dict[str, Any]]) -> set:
+        """
+        Get the subset of the candidate tweets' IDs that are already embedded.
+        Asking ChromaDB only for the candidate document IDs avoids pulling the
+        whole collection into memory on every embed run.
+        """
+        candidates = {tweet['tweet_id'] for tweet in tweets if tweet.get('tweet_id')}
+
+        # Anything this embedder has already seen or inserted needs no lookup
+        known = candidates & self._embedded_ids_cache
+        unknown = candidates - self._embedded_ids_cache
+        if not unknown:
+            return known
+
         try:
-            results = self.collection.get()
-            if 'metadatas' in results and results['metadatas']:
-                tweet_ids = set()
-                for metadata in results['metadatas']:
-                    if metadata and metadata.get('tweet_id'):
-                        tweet_ids.add(metadata['tweet_id'])
-                return tweet_ids
-            return set()
+            # include=[] asks Chroma for IDs only - no documents, metadatas
+            # or embeddings come back over the wire
+            results = self.collection.get(ids=[f"tweet_{tid}" for tid in unknown],
+                                          include=[])
+            found = {doc_id[len("tweet_"):] for doc_id in results['ids']}
+            self._embedded_ids_cache |= found
+            return known | found
         except Exception as e:
             print(f"Warning: Could not retrieve embedded tweet IDs: {e}")
-            return set()
+            return known
+
+    def _get_embedded_content_shas(self, shas: List[str]) -> set:
+        """
+        Get the subset of the candidate content hashes already stored in the
+        collection, querying only for hashes this embedder hasn't confirmed.
+        """
+        candidates = set(shas)
+        known = candidates & self._embedded_shas_cache
+        unknown = candidates - self._embedded_shas_cache
+        if not unknown:
+            return known
+
+        try:
+            results = self.collection.get(where={"content_sha": {"$in": sorted(unknown)}},
+                                          include=["metadatas"])
+            found = {metadata['content_sha'] for metadata in results.get('metadatas') or []
+                     if metadata and metadata.get('content_sha')}
+            self._embedded_shas_cache |= found
+            return known | found
+        except Exception as e:
+            print(f"Warning: Could not retrieve embedded content hashes: {e}")
+            return known